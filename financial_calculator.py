@@ -1,6 +1,6 @@
 """Core financial calculations used throughout the application."""
 
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import math
 
 # These packages are optional. They are only required for advanced
@@ -17,10 +17,109 @@ try:
 except Exception:  # pragma: no cover - optional dependency
     npf = None  # type: ignore
 
+
+def _annual_schedules(
+    base_monthly_rent: float,
+    rent_multiplier: float,
+    occupancy_rate: float,
+    growth_factors: List[float],
+    monthly_payment: float,
+    hoa_fees_annual: float
+) -> Tuple[List[float], List[float]]:
+    """
+    Return the annual net income and cash flow schedules for one scenario.
+    Works on plain floats so a schedule is a single pass over the holding
+    period rather than a chain of per-year method calls.
+    """
+    occupancy = occupancy_rate / 100
+    monthly_hoa = hoa_fees_annual / 12
+
+    net_income_schedule = []
+    cash_flow_schedule = []
+    for growth_factor in growth_factors:
+        effective_rent = base_monthly_rent * growth_factor * rent_multiplier * occupancy
+        net_income_schedule.append(effective_rent * 12 - hoa_fees_annual)
+        cash_flow_schedule.append((effective_rent - monthly_payment - monthly_hoa) * 12)
+    return net_income_schedule, cash_flow_schedule
+
+
+def _sign_changes(values: List[float]) -> int:
+    """Count sign changes in a cash flow series, ignoring zero entries."""
+    changes = 0
+    previous = 0.0
+    for value in values:
+        if value == 0:
+            continue
+        if previous and (value > 0) != (previous > 0):
+            changes += 1
+        previous = value
+    return changes
+
+
+def _irr_newton(
+    cash_flows: List[float],
+    guess: float = 0.1,
+    tol: float = 1e-12,
+    maxiter: int = 50
+) -> Optional[float]:
+    """
+    Solve NPV(rate) = 0 with Newton's method and return the rate as a fraction.
+    Iterates on the discount factor x = 1 / (1 + rate), where NPV is the
+    polynomial sum(cf_t * x**t), so each step is one Horner pass over the
+    cash flows. Returns None if the iteration does not converge to x > 0.
+    """
+    if guess <= -1:
+        return None
+    x = 1 / (1 + guess)
+    for _ in range(maxiter):
+        value = 0.0
+        slope = 0.0
+        for cash_flow in reversed(cash_flows):
+            slope = slope * x + value
+            value = value * x + cash_flow
+        if slope == 0 or not math.isfinite(value / slope):
+            return None
+        step = value / slope
+        x -= step
+        if x <= 0:
+            return None
+        if abs(step) <= tol * x:
+            return 1 / x - 1
+    return None
+
+
 class FinancialCalculator:
     """
     A comprehensive financial calculator for real estate investment analysis.
+
+    Instances are immutable once constructed: derived figures are computed in
+    __init__ and instances are shared through the web app's cache, so changing
+    an input would leave them stale. Build a new calculator instead.
     """
+
+    # Instances are built per request and cached by the web app; slots keep
+    # them small and make attribute reads in the calculation methods cheaper.
+    __slots__ = (
+        'property_price',
+        'down_payment',
+        'loan_term',
+        'interest_rate',
+        'interest_type',
+        'base_monthly_rent',
+        'occupancy_rate',
+        'rent_growth',
+        'enhancement_costs',
+        'hoa_fees_annual',
+        'holding_period',
+        'resale_value',
+        '_scenario_analysis',
+        '_loan_amount',
+        '_monthly_rate',
+        '_monthly_hoa',
+        '_total_initial_investment',
+        '_monthly_payment',
+        '_growth_factors',
+    )
     
     def __init__(
         self,
@@ -49,9 +148,34 @@ class FinancialCalculator:
         self.hoa_fees_annual = hoa_fees_annual
         self.holding_period = holding_period
         self.resale_value = resale_value or property_price * 1.2
+
+        # Scenario analysis is derived purely from the inputs above, so it is
+        # computed on first use and reused by every later caller.
+        self._scenario_analysis: Optional[Dict[str, Dict[str, Any]]] = None
         
         # Validate inputs
         self._validate_inputs()
+
+        # Loan and cost figures are fixed once the inputs are set, so derive
+        # them here instead of recomputing them on every getter call.
+        self._loan_amount = self.property_price - self.down_payment
+        self._monthly_rate = self.interest_rate / 100 / 12
+        self._monthly_hoa = self.hoa_fees_annual / 12
+        self._total_initial_investment = self.down_payment + self.enhancement_costs
+        self._monthly_payment = self._compute_monthly_payment()
+
+        # Compounded rent growth factor for each holding year (index 0 = year 1)
+        growth = 1 + self.rent_growth / 100
+        self._growth_factors = [growth ** year for year in range(self.holding_period)]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # _growth_factors is the last attribute set by __init__
+        if hasattr(self, '_growth_factors'):
+            raise AttributeError(f"{type(self).__name__} is immutable; create a new instance instead")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable; create a new instance instead")
     
     def _validate_inputs(self):
         """Validate input parameters."""
@@ -74,11 +198,14 @@ class FinancialCalculator:
     
     def get_loan_amount(self) -> float:
         """Calculate the loan amount."""
-        return self.property_price - self.down_payment
-    
+        return self._loan_amount
+
     def get_monthly_payment(self) -> float:
         """Calculate monthly payment based on interest type."""
-        loan_amount = self.get_loan_amount()
+        return self._monthly_payment
+    
+    def _compute_monthly_payment(self) -> float:
+        loan_amount = self._loan_amount
 
         if loan_amount <= 0:
             return 0
@@ -89,7 +216,7 @@ class FinancialCalculator:
             total_interest = loan_amount * (self.interest_rate / 100) * self.loan_term
             return (loan_amount + total_interest) / num_payments
 
-        monthly_rate = self.interest_rate / 100 / 12
+        monthly_rate = self._monthly_rate
 
         if monthly_rate == 0:
             return loan_amount / num_payments
@@ -117,7 +244,7 @@ class FinancialCalculator:
     
     def get_total_initial_investment(self) -> float:
         """Calculate total initial investment."""
-        return self.down_payment + self.enhancement_costs
+        return self._total_initial_investment
     
     def get_effective_monthly_rent(self, rent_multiplier: float = 1.0) -> float:
         """Calculate effective monthly rent considering occupancy rate."""
@@ -128,6 +255,8 @@ class FinancialCalculator:
 
     def _rent_growth_factor(self, year: int) -> float:
         """Return compounded growth factor for a given year (1-indexed)."""
+        if 1 <= year <= self.holding_period:
+            return self._growth_factors[year - 1]
         return (1 + self.rent_growth / 100) ** (year - 1)
 
     def get_monthly_rent_for_year(self, year: int, rent_multiplier: float = 1.0) -> float:
@@ -140,9 +269,7 @@ class FinancialCalculator:
 
     def get_monthly_cash_flow_for_year(self, year: int, rent_multiplier: float = 1.0) -> float:
         effective_rent = self.get_effective_monthly_rent_for_year(year, rent_multiplier)
-        monthly_payment = self.get_monthly_payment()
-        monthly_hoa = self.hoa_fees_annual / 12
-        return effective_rent - monthly_payment - monthly_hoa
+        return effective_rent - self._monthly_payment - self._monthly_hoa
 
     def get_annual_net_income_for_year(self, year: int, rent_multiplier: float = 1.0) -> float:
         effective_rent = self.get_effective_monthly_rent_for_year(year, rent_multiplier)
@@ -151,19 +278,26 @@ class FinancialCalculator:
     def get_annual_cash_flow_for_year(self, year: int, rent_multiplier: float = 1.0) -> float:
         return self.get_monthly_cash_flow_for_year(year, rent_multiplier) * 12
 
+    def _schedules(self, rent_multiplier: float = 1.0) -> Tuple[List[float], List[float]]:
+        return _annual_schedules(
+            self.base_monthly_rent,
+            rent_multiplier,
+            self.occupancy_rate,
+            self._growth_factors,
+            self._monthly_payment,
+            self.hoa_fees_annual
+        )
+
     def get_net_income_schedule(self, rent_multiplier: float = 1.0) -> list:
-        return [self.get_annual_net_income_for_year(y, rent_multiplier) for y in range(1, self.holding_period + 1)]
+        return self._schedules(rent_multiplier)[0]
 
     def get_cash_flow_schedule(self, rent_multiplier: float = 1.0) -> list:
-        return [self.get_annual_cash_flow_for_year(y, rent_multiplier) for y in range(1, self.holding_period + 1)]
+        return self._schedules(rent_multiplier)[1]
     
     def get_monthly_cash_flow(self, rent_multiplier: float = 1.0) -> float:
         """Calculate monthly cash flow."""
         effective_rent = self.get_effective_monthly_rent(rent_multiplier)
-        monthly_payment = self.get_monthly_payment()
-        monthly_hoa = self.hoa_fees_annual / 12
-        
-        return effective_rent - monthly_payment - monthly_hoa
+        return effective_rent - self._monthly_payment - self._monthly_hoa
     
     def get_annual_net_income(self, rent_multiplier: float = 1.0) -> float:
         """Calculate annual net rental income (before mortgage)."""
@@ -180,8 +314,10 @@ class FinancialCalculator:
         cash_flows = self.get_cash_flow_schedule(rent_multiplier)
         if not cash_flows:
             return 0
-        avg_cash_flow = sum(cash_flows) / len(cash_flows)
-        total_investment = self.get_total_initial_investment()
+        return self._roi_from_average(sum(cash_flows) / len(cash_flows))
+
+    def _roi_from_average(self, avg_cash_flow: float) -> float:
+        total_investment = self._total_initial_investment
         if total_investment <= 0:
             return 0
         return (avg_cash_flow / total_investment) * 100
@@ -191,38 +327,47 @@ class FinancialCalculator:
         Calculate Internal Rate of Return (IRR) including resale value.
         Returns IRR as percentage or None if calculation fails.
         """
-        # IRR relies on numpy-financial. If it's not available simply return
-        # None so that basic functionality can still be tested without the
-        # heavy dependency.
-        if npf is None:
-            return None
+        return self._irr_from_cash_flows(self.get_cash_flow_schedule(rent_multiplier))
 
+    def _irr_from_cash_flows(self, cash_flow_schedule: List[float], guess: float = 0.1) -> Optional[float]:
         try:
             # Initial investment (negative cash flow)
             initial_investment = -self.get_total_initial_investment()
 
-            cash_flows = [self.get_annual_cash_flow_for_year(y, rent_multiplier) for y in range(1, self.holding_period + 1)]
+            cash_flows = list(cash_flow_schedule)
             # Add resale proceeds in final year
             cash_flows[-1] += self.resale_value - self.property_price
 
             # Combine initial investment with cash flows
             all_cash_flows = [initial_investment] + cash_flows
             
-            # Calculate IRR
-            irr = npf.irr(all_cash_flows)
+            # Calculate IRR. With a single sign change the rate is unique, so a
+            # Newton solve gives the same answer as numpy-financial's
+            # polynomial root search at a fraction of the cost.
+            sign_changes = _sign_changes(all_cash_flows)
+            if sign_changes == 0:
+                # All flows share one sign (or are zero): NPV has no root
+                return None
+
+            irr = None
+            if sign_changes == 1:
+                irr = _irr_newton(all_cash_flows, guess)
+            if irr is None:
+                # numpy-financial is optional. If it's not available simply
+                # return None so that basic functionality can still be tested
+                # without the heavy dependency.
+                if npf is None:
+                    return None
+                irr = npf.irr(all_cash_flows)
 
             # Return as percentage, handle NaN, infinity, or complex numbers
-            if (
-                irr is None
-                or math.isnan(float(irr))
-                or math.isinf(float(irr))
-                or isinstance(irr, complex)
-            ):
+            if irr is None or isinstance(irr, complex):
                 return None
 
-            # Convert to percentage and ensure it's a valid float
-            irr_percentage = float(irr * 100)
-            if math.isnan(irr_percentage) or math.isinf(irr_percentage):
+            # Convert to a plain float percentage once; a non-finite value
+            # covers both NaN and infinity
+            irr_percentage = float(irr) * 100
+            if not math.isfinite(irr_percentage):
                 return None
                 
             return irr_percentage
@@ -233,8 +378,23 @@ class FinancialCalculator:
     def get_scenario_analysis(self) -> Dict[str, Dict[str, Any]]:
         """
         Generate analysis for three scenarios: Conservative, Base, and Optimistic.
-        Returns dictionary with scenario data.
+        Returns dictionary with scenario data. The analysis is computed once
+        per instance; each call returns a copy, so callers may modify it freely.
         """
+        return {
+            key: dict(
+                scenario,
+                net_income_schedule=list(scenario['net_income_schedule']),
+                cash_flow_schedule=list(scenario['cash_flow_schedule'])
+            )
+            for key, scenario in self._scenario_results().items()
+        }
+
+    def _scenario_results(self) -> Dict[str, Dict[str, Any]]:
+        """Compute the scenario analysis on first use and cache it on the instance."""
+        if self._scenario_analysis is not None:
+            return self._scenario_analysis
+
         scenarios = {
             'conservative': {'multiplier': 0.85, 'name': 'Conservative'},
             'base': {'multiplier': 1.0, 'name': 'Base'},
@@ -242,20 +402,26 @@ class FinancialCalculator:
         }
         
         results = {}
+        irr_guess = 0.1
         
         for scenario_key, scenario_info in scenarios.items():
             multiplier = scenario_info['multiplier']
             monthly_rent = self.get_monthly_rent_for_year(1, multiplier)
             effective_monthly_rent = self.get_effective_monthly_rent_for_year(1, multiplier)
 
-            net_income_schedule = self.get_net_income_schedule(multiplier)
-            cash_flow_schedule = self.get_cash_flow_schedule(multiplier)
+            net_income_schedule, cash_flow_schedule = self._schedules(multiplier)
 
             avg_net_income = sum(net_income_schedule) / len(net_income_schedule)
             avg_cash_flow = sum(cash_flow_schedule) / len(cash_flow_schedule)
 
-            roi = self.get_roi(multiplier)
-            irr = self.get_irr(multiplier)
+            # ROI and IRR reuse this scenario's schedule and average rather
+            # than rebuilding them
+            roi = self._roi_from_average(avg_cash_flow)
+            irr = self._irr_from_cash_flows(cash_flow_schedule, irr_guess)
+            if irr is not None:
+                # Scenarios differ only by a rent multiplier, so the previous
+                # scenario's rate is a close starting point for the next solve
+                irr_guess = irr / 100
 
             results[scenario_key] = {
                 'monthly_rent': monthly_rent,
@@ -269,6 +435,8 @@ class FinancialCalculator:
                 'cash_flow_schedule': cash_flow_schedule
             }
         
+        # The one lazily filled attribute, set past the immutability guard
+        object.__setattr__(self, '_scenario_analysis', results)
         return results
     
     def get_amortization_schedule(self, num_periods: Optional[int] = None) -> Dict[str, list]:
@@ -278,10 +446,13 @@ class FinancialCalculator:
         """
         if num_periods is None:
             num_periods = self.loan_term * 12
+
+        if np is not None:
+            return self._amortization_schedule_closed_form(num_periods)
         
-        loan_amount = self.get_loan_amount()
-        monthly_payment = self.get_monthly_payment()
-        monthly_rate = self.interest_rate / 100 / 12
+        loan_amount = self._loan_amount
+        monthly_payment = self._monthly_payment
+        monthly_rate = self._monthly_rate
         
         schedule = {
             'period': [],
@@ -317,12 +488,56 @@ class FinancialCalculator:
             schedule['balance'].append(max(0, remaining_balance))
         
         return schedule
+
+    def _amortization_schedule_closed_form(self, num_periods: int) -> Dict[str, list]:
+        """
+        Array version of the amortization loop in get_amortization_schedule.
+        The opening balance of every period comes from the closed-form loan
+        balance formula, so no period depends on the previous one.
+        """
+        loan_amount = self._loan_amount
+        monthly_payment = self._monthly_payment
+        monthly_rate = self._monthly_rate
+
+        count = max(0, min(num_periods, self.loan_term * 12))
+        if loan_amount <= 0 or count == 0:
+            return {'period': [], 'payment': [], 'principal': [], 'interest': [], 'balance': []}
+
+        elapsed = np.arange(count, dtype=float)  # periods already paid
+        if self.interest_type == "simple":
+            interest = np.full(count, loan_amount * (self.interest_rate / 100) / 12)
+            opening_balance = loan_amount - (monthly_payment - interest[0]) * elapsed
+        elif monthly_rate == 0:
+            interest = np.zeros(count)
+            opening_balance = loan_amount - monthly_payment * elapsed
+        else:
+            growth = (1 + monthly_rate) ** elapsed
+            opening_balance = loan_amount * growth - monthly_payment * (growth - 1) / monthly_rate
+            interest = opening_balance * monthly_rate
+
+        # The loop stops once the balance is paid off
+        paid_off = np.flatnonzero(opening_balance <= 0)
+        if paid_off.size:
+            count = int(paid_off[0])
+            opening_balance = opening_balance[:count]
+            interest = interest[:count]
+
+        principal = np.minimum(monthly_payment - interest, opening_balance)
+        balance = np.maximum(opening_balance - principal, 0)
+
+        return {
+            'period': list(range(1, count + 1)),
+            'payment': [monthly_payment] * count,
+            'principal': principal.tolist(),
+            'interest': interest.tolist(),
+            'balance': balance.tolist()
+        }
     
     def get_investment_summary(self) -> Dict[str, Any]:
         """
         Get a comprehensive investment summary.
         """
-        base_scenario = self.get_scenario_analysis()['base']
+        base_scenario = self._scenario_results()['base']
         
         return {
             'property_price': self.property_price,
@@ -1,23 +1,49 @@
 from flask import Flask, render_template, request, jsonify, send_file
-import pandas as pd
+from flask.json.provider import DefaultJSONProvider
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import plotly.utils
-import json
 import math
 import io
-import os
-import tempfile
+from functools import lru_cache
 from financial_calculator import FinancialCalculator
-from utils import (
-    format_currency, format_percentage, format_currency_with_color,
-    format_percentage_with_color, export_to_excel, get_advanced_metrics
-)
-from report_generator import generate_pdf_report
+from utils import export_to_excel, get_advanced_metrics
+
+# The PDF report stack (WeasyPrint, matplotlib) is only needed by the PDF
+# export route, so it is imported there rather than at startup.
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes and decodes with orjson, including numpy arrays and scalars"""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        # jsonify asks for compact separators, or indent=2 in debug mode;
+        # orjson covers both, and any other option goes to the stdlib encoder
+        if kwargs == {'indent': 2}:
+            option |= orjson.OPT_INDENT_2
+        elif kwargs and kwargs != {'separators': (',', ':')}:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        # request.get_json() decodes through here; orjson's JSONDecodeError
+        # is a ValueError, so malformed bodies still get Flask's 400
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
 
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Yearly schedules reach the frontend as cumulative chart series, so the
+# per-scenario copies are left out of the /calculate payload
+SCHEDULE_FIELDS = ('net_income_schedule', 'cash_flow_schedule')
 
 def sanitize_json_data(data):
     """
@@ -26,6 +52,17 @@ def sanitize_json_data(data):
     if isinstance(data, dict):
         return {key: sanitize_json_data(value) for key, value in data.items()}
     elif isinstance(data, list):
+        # Numeric lists (chart series) are checked in one numpy pass. Anything
+        # else is walked item by item: numpy turns a list mixing strings and
+        # floats into a string array, which would hide NaN and infinity
+        try:
+            values = np.asarray(data)
+        except ValueError:
+            values = None
+        if values is not None:
+            kind = values.dtype.kind
+            if kind in 'biu' or (kind == 'f' and np.isfinite(values).all()):
+                return data
         return [sanitize_json_data(item) for item in data]
     elif isinstance(data, float):
         if math.isnan(data) or math.isinf(data):
@@ -41,9 +78,14 @@ def index():
 
 def clean_numeric_input(value):
     """Clean numeric input by removing commas and converting to float"""
-    if isinstance(value, str):
-        return float(value.replace(',', ''))
-    return float(value)
+    # The dashboard posts plain numeric strings, so parse directly and only
+    # strip thousands separators when that fails
+    try:
+        return float(value)
+    except ValueError:
+        if isinstance(value, str):
+            return float(value.replace(',', ''))
+        raise
 
 @app.route('/calculate', methods=['POST'])
 def calculate():
@@ -51,90 +93,81 @@ def calculate():
     try:
         # Get form data
         data = request.get_json()
-        print(f"Received data: {data}")  # Debug logging
-        
-        # Extract and clean parameters
-        property_price = clean_numeric_input(data.get('property_price', 0))
-        down_payment = clean_numeric_input(data.get('down_payment', 0))
-        loan_term = int(data.get('loan_term', 30))
-        interest_rate = clean_numeric_input(data.get('interest_rate', 0))
-        interest_type = data.get('interest_type', 'apr')
-        annual_rental_income = clean_numeric_input(data.get('base_monthly_rent', 0))  # This is actually annual income
-        base_monthly_rent = annual_rental_income / 12  # Convert to monthly
-        occupancy_rate = clean_numeric_input(data.get('occupancy_rate', 95))
-        rent_growth = clean_numeric_input(data.get('rent_growth', 0))
-        enhancement_costs = clean_numeric_input(data.get('enhancement_costs', 0))
-        hoa_fees_annual = clean_numeric_input(data.get('hoa_fees_annual', 0))
-        holding_period = int(data.get('holding_period', 10))
-        resale_value = clean_numeric_input(data.get('resale_value', 0))
+        # Lazy %-style arguments: nothing is formatted unless debug logging is on
+        app.logger.debug("Received data: %s", data)
         
-        print(f"Processed values: price={property_price}, down={down_payment}, annual_rent={annual_rental_income}, monthly_rent={base_monthly_rent}")  # Debug logging
+        # Reuse the calculator for repeated submissions of the same inputs
+        inputs = _calculator_inputs(data)
+        calc = _cached_calculator(inputs)
         
-        # Create calculator instance
-        calc = FinancialCalculator(
-            property_price=property_price,
-            down_payment=down_payment,
-            loan_term=loan_term,
-            interest_rate=interest_rate,
-            interest_type=interest_type,
-            base_monthly_rent=base_monthly_rent,
-            occupancy_rate=occupancy_rate,
-            rent_growth=rent_growth,
-            enhancement_costs=enhancement_costs,
-            hoa_fees_annual=hoa_fees_annual,
-            holding_period=holding_period,
-            resale_value=resale_value
+        app.logger.debug(
+            "Processed values: price=%s, down=%s, monthly_rent=%s",
+            calc.property_price, calc.down_payment, calc.base_monthly_rent
         )
         
-        # Get scenario analysis
-        scenarios = calc.get_scenario_analysis()
-        
-        # Get advanced metrics
-        advanced_metrics = get_advanced_metrics(calc)
-        
-        # Prepare charts data
-        charts_data = prepare_charts_data(calc, scenarios, advanced_metrics)
-        
-        # Format response
-        response = {
-            'success': True,
-            'scenarios': scenarios,
-            'advanced_metrics': advanced_metrics,
-            'charts': charts_data,
-            'calculator_data': {
-                'total_investment': calc.get_total_initial_investment(),
-                'loan_amount': calc.get_loan_amount(),
-                'monthly_payment': calc.get_monthly_payment(),
-                'total_interest': calc.get_total_interest(),
-                'break_even_years': advanced_metrics['payback_period'],
-                'occupancy_rate': calc.occupancy_rate,
-                'hoa_fees_annual': calc.hoa_fees_annual
-            }
-        }
-        
-        # Sanitize the response to handle infinity and NaN values
-        sanitized_response = sanitize_json_data(response)
-        
-        return jsonify(sanitized_response)
+        return app.response_class(_analysis_json(inputs), mimetype=app.json.mimetype)
         
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error in calculation: {str(e)}")
-        print(f"Full traceback:\n{error_trace}")
+        app.logger.exception("Error in calculation")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 400
 
+@lru_cache(maxsize=128)
+def _analysis_json(inputs):
+    """Serialize the /calculate payload once per distinct set of inputs"""
+    response = _analysis_response(inputs)
+    if orjson is None:
+        # orjson already writes NaN and infinity as null; the stdlib encoder
+        # would emit them as bare NaN/Infinity tokens, which is invalid JSON
+        response = sanitize_json_data(response)
+    return app.json.dumps(response) + '\n'
+
+def _analysis_response(inputs):
+    """Build the /calculate payload"""
+    calc = _cached_calculator(inputs)
+    
+    # Get scenario analysis
+    scenarios = calc.get_scenario_analysis()
+    
+    # Get advanced metrics
+    advanced_metrics = _cached_advanced_metrics(inputs)
+    
+    # Prepare charts data
+    charts_data = prepare_charts_data(calc, scenarios, advanced_metrics)
+    
+    # Format response
+    response = {
+        'success': True,
+        'scenarios': {
+            key: {field: value for field, value in scenario.items() if field not in SCHEDULE_FIELDS}
+            for key, scenario in scenarios.items()
+        },
+        'advanced_metrics': advanced_metrics,
+        'charts': charts_data,
+        'calculator_data': {
+            'total_investment': advanced_metrics['total_initial_investment'],
+            'loan_amount': calc.get_loan_amount(),
+            'monthly_payment': calc.get_monthly_payment(),
+            'total_interest': calc.get_total_interest(),
+            'break_even_years': advanced_metrics['payback_period'],
+            'occupancy_rate': calc.occupancy_rate,
+            'hoa_fees_annual': calc.hoa_fees_annual
+        }
+    }
+    
+    return response
+
 def prepare_charts_data(calc, scenarios, advanced_metrics):
     """Prepare chart data for frontend"""
+    total_investment = calc.get_total_initial_investment()
     
     # KPI Cards data
     kpi_data = {
         'monthly_cash_flow': scenarios['base']['monthly_cash_flow'],
         'annual_roi': scenarios['base']['roi'],
-        'total_investment': calc.get_total_initial_investment(),
+        'total_investment': total_investment,
         'break_even_years': advanced_metrics['payback_period']
     }
     
@@ -145,14 +178,14 @@ def prepare_charts_data(calc, scenarios, advanced_metrics):
         'scenarios': {}
     }
     
-    for scenario_key, scenario_name in [('conservative', 'Conservative'), ('base', 'Base'), ('optimistic', 'Optimistic')]:
-        schedule = scenarios[scenario_key]['cash_flow_schedule']
-        cumulative = []
-        total = 0
-        for cf in schedule:
-            total += cf
-            cumulative.append(total)
-        cash_flow_data['scenarios'][scenario_name] = cumulative
+    scenario_names = [('conservative', 'Conservative'), ('base', 'Base'), ('optimistic', 'Optimistic')]
+    # One (scenarios, years) matrix, accumulated along the year axis
+    cumulative = np.cumsum(
+        np.array([scenarios[key]['cash_flow_schedule'] for key, _ in scenario_names], dtype=float),
+        axis=1
+    )
+    for (_, scenario_name), row in zip(scenario_names, cumulative):
+        cash_flow_data['scenarios'][scenario_name] = row.tolist()
     
     # Investment Breakdown (Donut Chart)
     investment_breakdown = {
@@ -173,7 +206,7 @@ def prepare_charts_data(calc, scenarios, advanced_metrics):
         'cash_flow_data': cash_flow_data,
         'investment_breakdown': investment_breakdown,
         'roi_comparison': roi_comparison,
-        'break_even_amount': calc.get_total_initial_investment()
+        'break_even_amount': total_investment
     }
 
 @app.route('/export_excel', methods=['POST'])
@@ -182,29 +215,8 @@ def export_excel():
     try:
         data = request.get_json()
         
-        # Recreate calculator from data
-        calc = create_calculator_from_data(data)
-        scenarios = calc.get_scenario_analysis()
-        
-        # Create scenario DataFrame
-        scenario_data = []
-        for scenario_key, scenario_name in [('conservative', 'Conservative'), ('base', 'Base'), ('optimistic', 'Optimistic')]:
-            scenario_data.append({
-                'Scenario': scenario_name,
-                'Monthly Cash Flow': format_currency(scenarios[scenario_key]['monthly_cash_flow']),
-                'Annual Cash Flow': format_currency(scenarios[scenario_key]['annual_cash_flow']),
-                'Annual ROI': format_percentage(scenarios[scenario_key]['roi']),
-                'Monthly Rent': format_currency(scenarios[scenario_key]['monthly_rent']),
-                'IRR': format_percentage(scenarios[scenario_key]['irr']) if scenarios[scenario_key]['irr'] else 'N/A'
-            })
-        
-        scenario_df = pd.DataFrame(scenario_data)
-        
-        # Export to Excel
-        excel_buffer = export_to_excel(calc, scenarios, scenario_df)
-        
         return send_file(
-            excel_buffer,
+            io.BytesIO(_excel_workbook(_calculator_inputs(data))),
             as_attachment=True,
             download_name='investment_analysis.xlsx',
             mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
@@ -213,28 +225,38 @@ def export_excel():
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+@lru_cache(maxsize=32)
+def _excel_workbook(inputs):
+    """Render the Excel export once per distinct set of inputs and keep its bytes"""
+    calc = _cached_calculator(inputs)
+    return export_to_excel(calc, calc.get_scenario_analysis()).getvalue()
+
 @app.route('/export_pdf', methods=['POST'])
 def export_pdf():
     """Export analysis to PDF"""
     try:
+        from report_generator import generate_pdf_report
+
         data = request.get_json()
         
         # Recreate calculator from data
-        calc = create_calculator_from_data(data)
+        inputs = _calculator_inputs(data)
+        calc = _cached_calculator(inputs)
         scenarios = calc.get_scenario_analysis()
-        advanced_metrics = get_advanced_metrics(calc)
+        advanced_metrics = _cached_advanced_metrics(inputs)
         
-        # Export to PDF using HTML + WeasyPrint
-        tmp_dir = tempfile.gettempdir()
-        pdf_path = os.path.join(tmp_dir, 'investment_analysis.pdf')
+        # Export to PDF using HTML + WeasyPrint, rendered in memory so
+        # concurrent exports never share a file on disk
+        buffer = io.BytesIO()
         generate_pdf_report({
             'calculator': calc,
             'scenarios': scenarios,
             'advanced_metrics': advanced_metrics
-        }, pdf_path)
+        }, buffer)
+        buffer.seek(0)
 
         return send_file(
-            pdf_path,
+            buffer,
             as_attachment=True,
             download_name='investment_analysis.pdf',
             mimetype='application/pdf'
@@ -243,27 +265,41 @@ def export_pdf():
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
-def create_calculator_from_data(data):
-    """Helper function to recreate calculator from form data"""
+def _calculator_inputs(data):
+    """Clean form data into a hashable tuple of calculator keyword arguments"""
     # The form field 'base_monthly_rent' actually contains ANNUAL rental income
     # despite its misleading name (legacy from when it was monthly)
     annual_rental_income = clean_numeric_input(data.get('base_monthly_rent', 0))
     base_monthly_rent = annual_rental_income / 12  # Convert annual to monthly
     
-    return FinancialCalculator(
-        property_price=clean_numeric_input(data.get('property_price', 0)),
-        down_payment=clean_numeric_input(data.get('down_payment', 0)),
-        loan_term=int(data.get('loan_term', 30)),
-        interest_rate=clean_numeric_input(data.get('interest_rate', 0)),
-        interest_type=data.get('interest_type', 'apr'),
-        base_monthly_rent=base_monthly_rent,  # This is now correctly monthly
-        occupancy_rate=clean_numeric_input(data.get('occupancy_rate', 95)),
-        rent_growth=clean_numeric_input(data.get('rent_growth', 0)),
-        enhancement_costs=clean_numeric_input(data.get('enhancement_costs', 0)),
-        hoa_fees_annual=clean_numeric_input(data.get('hoa_fees_annual', 0)),
-        holding_period=int(data.get('holding_period', 10)),
-        resale_value=clean_numeric_input(data.get('resale_value', 0))
+    return (
+        ('property_price', clean_numeric_input(data.get('property_price', 0))),
+        ('down_payment', clean_numeric_input(data.get('down_payment', 0))),
+        ('loan_term', int(data.get('loan_term', 30))),
+        ('interest_rate', clean_numeric_input(data.get('interest_rate', 0))),
+        ('interest_type', data.get('interest_type', 'apr')),
+        ('base_monthly_rent', base_monthly_rent),  # This is now correctly monthly
+        ('occupancy_rate', clean_numeric_input(data.get('occupancy_rate', 95))),
+        ('rent_growth', clean_numeric_input(data.get('rent_growth', 0))),
+        ('enhancement_costs', clean_numeric_input(data.get('enhancement_costs', 0))),
+        ('hoa_fees_annual', clean_numeric_input(data.get('hoa_fees_annual', 0))),
+        ('holding_period', int(data.get('holding_period', 10))),
+        ('resale_value', clean_numeric_input(data.get('resale_value', 0)))
     )
 
+@lru_cache(maxsize=128)
+def _cached_calculator(inputs):
+    """Build one calculator per distinct set of cleaned inputs"""
+    return FinancialCalculator(**dict(inputs))
+
+@lru_cache(maxsize=128)
+def _advanced_metrics(inputs):
+    """Compute advanced metrics once per distinct set of cleaned inputs"""
+    return get_advanced_metrics(_cached_calculator(inputs))
+
+def _cached_advanced_metrics(inputs):
+    """Return a copy of the cached advanced metrics, so callers cannot alter the shared dict"""
+    return dict(_advanced_metrics(inputs))
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
@@ -1,15 +1,19 @@
+import base64
+import io
 import os
 from datetime import datetime
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, BinaryIO, Union
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
-# 🔧 Set headless backend before importing pyplot
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+# Charts are drawn on standalone Figures rather than through pyplot, so no
+# GUI backend or global figure registry is involved in a request.
+from matplotlib.figure import Figure
+import numpy as np
 
-from weasyprint import HTML
+from weasyprint import CSS, HTML
+from weasyprint.text.fonts import FontConfiguration
 from financial_calculator import FinancialCalculator
 from helpers import (
     format_currency,
@@ -17,6 +21,28 @@ from helpers import (
 )
 from utils import get_risk_assessment
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# One environment per process so the compiled report template is reused
+# across requests instead of being re-parsed for every PDF. Templates ship
+# with the app, so there is no need to stat them for changes on each render.
+_TEMPLATE_ENV = Environment(
+    loader=FileSystemLoader(os.path.join(BASE_DIR, 'templates')),
+    autoescape=select_autoescape(['html']),
+    auto_reload=False
+)
+_REPORT_TEMPLATE = _TEMPLATE_ENV.get_template('report.html')
+
+# The report stylesheet (and the style.css it imports) is parsed once per
+# process and handed to WeasyPrint with each render. Both share one font
+# configuration, so fonts loaded for @font-face rules (such as the template's
+# Google Fonts link) are resolved once instead of on every export.
+_FONT_CONFIG = FontConfiguration()
+_REPORT_CSS = CSS(
+    filename=os.path.join(BASE_DIR, 'static', 'css', 'report.css'),
+    font_config=_FONT_CONFIG
+)
+
 
 def _interpret_metric(label: str, value: float) -> str:
     """Return a simple interpretation for advanced metrics."""
@@ -61,77 +87,84 @@ def _interpret_metric(label: str, value: float) -> str:
     return ''
 
 
-def _generate_charts(calc: FinancialCalculator, scenarios: Dict[str, Any], img_dir: str) -> list:
-    os.makedirs(img_dir, exist_ok=True)
-    charts = []
-    years = list(range(1, calc.holding_period + 1))
-    cumulative = {}
-    for key, name in [('conservative', 'Conservative'), ('base', 'Base'), ('optimistic', 'Optimistic')]:
-        total = 0
-        cumulative[name] = []
-        for cf in scenarios[key]['cash_flow_schedule']:
-            total += cf
-            cumulative[name].append(total)
-        # pad to full length if needed
-        if len(cumulative[name]) < len(years):
-            cumulative[name].extend([total] * (len(years) - len(cumulative[name])))
-
-    fig, ax = plt.subplots(figsize=(6, 3))
-    for name, values in cumulative.items():
+def _png_data_uri(fig) -> str:
+    """Render a figure as an embeddable PNG data URI."""
+    buffer = io.BytesIO()
+    fig.tight_layout()
+    fig.savefig(buffer, format='png')
+    return 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+# Each chart is cached on the values it plots, so a repeated export of the
+# same analysis skips matplotlib entirely.
+
+@lru_cache(maxsize=32)
+def _cumulative_cash_flow_chart(years: tuple, series: tuple, break_even: float) -> str:
+    fig = Figure(figsize=(6, 3))
+    ax = fig.subplots()
+    for name, values in series:
         ax.plot(years, values, marker='o', label=name)
-    ax.axhline(calc.get_total_initial_investment(), color='orange', linestyle='--', label='Break-even')
+    ax.axhline(break_even, color='orange', linestyle='--', label='Break-even')
     ax.set_xlabel('Year')
     ax.set_ylabel('Cumulative Cash Flow (SAR)')
     ax.legend()
-    path_cf = os.path.join(img_dir, 'cumulative_cash_flow.png')
-    fig.tight_layout()
-    fig.savefig(path_cf)
-    plt.close(fig)
-    charts.append(path_cf)
+    return _png_data_uri(fig)
 
-    fig, ax = plt.subplots(figsize=(4, 3))
+
+@lru_cache(maxsize=32)
+def _investment_breakdown_chart(values: tuple) -> str:
+    fig = Figure(figsize=(4, 3))
+    ax = fig.subplots()
     labels = ['Down Payment', 'Enhancement Costs', 'Loan Amount']
-    values = [calc.down_payment, calc.enhancement_costs, calc.get_loan_amount()]
     colors_pie = ['#4285F4', '#34A853', '#FBBC04']
     ax.pie(values, labels=labels, colors=colors_pie, autopct='%1.1f%%', startangle=90)
     ax.axis('equal')
-    path_pie = os.path.join(img_dir, 'investment_breakdown.png')
-    fig.tight_layout()
-    fig.savefig(path_pie)
-    plt.close(fig)
-    charts.append(path_pie)
+    return _png_data_uri(fig)
+
 
-    fig, ax = plt.subplots(figsize=(4, 3))
+@lru_cache(maxsize=32)
+def _roi_comparison_chart(roi_values: tuple) -> str:
+    fig = Figure(figsize=(4, 3))
+    ax = fig.subplots()
     labels_bar = ['Conservative', 'Base', 'Optimistic']
-    roi_values = [scenarios['conservative']['roi'], scenarios['base']['roi'], scenarios['optimistic']['roi']]
     colors_bar = ['#6C757D', '#4285F4', '#34A853']
     ax.bar(labels_bar, roi_values, color=colors_bar)
     ax.set_ylabel('ROI (%)')
-    path_bar = os.path.join(img_dir, 'roi_comparison.png')
-    fig.tight_layout()
-    fig.savefig(path_bar)
-    plt.close(fig)
-    charts.append(path_bar)
+    return _png_data_uri(fig)
+
+
+def _generate_charts(calc: FinancialCalculator, scenarios: Dict[str, Any]) -> list:
+    """Return the report charts as PNG data URIs."""
+    years = tuple(range(1, calc.holding_period + 1))
+    scenario_names = [('conservative', 'Conservative'), ('base', 'Base'), ('optimistic', 'Optimistic')]
+    # Schedules span the holding period, so they stack into one
+    # (scenarios, years) matrix accumulated along the year axis
+    cumulative = np.cumsum(
+        np.array([scenarios[key]['cash_flow_schedule'] for key, _ in scenario_names], dtype=float),
+        axis=1
+    )
+
+    return [
+        _cumulative_cash_flow_chart(
+            years,
+            tuple((name, tuple(values.tolist())) for (_, name), values in zip(scenario_names, cumulative)),
+            calc.get_total_initial_investment()
+        ),
+        _investment_breakdown_chart((calc.down_payment, calc.enhancement_costs, calc.get_loan_amount())),
+        _roi_comparison_chart(tuple(scenarios[key]['roi'] for key, _ in scenario_names)),
+    ]
 
-    return charts
 
+def generate_pdf_report(data: Dict[str, Any], output_path: Union[str, BinaryIO]) -> Union[str, BinaryIO]:
+    """Generate a PDF report using HTML and WeasyPrint.
 
-def generate_pdf_report(data: Dict[str, Any], output_path: str) -> str:
-    """Generate a PDF report using HTML and WeasyPrint."""
+    ``output_path`` may be a file path or a writable binary file object.
+    """
     calc: FinancialCalculator = data['calculator']
     scenarios = data['scenarios']
     advanced = data['advanced_metrics']
 
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    template_dir = os.path.join(base_dir, 'templates')
-    env = Environment(
-        loader=FileSystemLoader(template_dir),
-        autoescape=select_autoescape(['html'])
-    )
-    template = env.get_template('report.html')
-
-    img_dir = os.path.join(base_dir, 'static', 'report_images')
-    charts = _generate_charts(calc, scenarios, img_dir)
+    charts = _generate_charts(calc, scenarios)
 
     inv_summary = [
         {'label': 'Property Price', 'value': format_currency(calc.property_price)},
@@ -178,19 +211,20 @@ def generate_pdf_report(data: Dict[str, Any], output_path: str) -> str:
             'irr': format_percentage(s['irr']) if s['irr'] is not None else 'N/A',
         })
 
-    html_content = template.render(
+    html_content = _REPORT_TEMPLATE.render(
         title='Real Estate Investment Analysis Report',
         date=datetime.now().strftime('%Y-%m-%d'),
         logo=None,
         investment_summary=inv_summary,
         advanced_metrics=adv_metrics,
         scenarios=scenario_rows,
-        charts=[os.path.relpath(c, base_dir) for c in charts],
+        charts=charts,
         risk_level=risk_assessment['risk_level'],
         risk_factors=risk_assessment['risk_factors'],
-        recommendations=risk_assessment['recommendations'],
-        css_path=os.path.relpath(os.path.join(base_dir, 'static', 'css', 'report.css'), base_dir)
+        recommendations=risk_assessment['recommendations']
     )
 
-    HTML(string=html_content, base_url=base_dir).write_pdf(output_path)
+    HTML(string=html_content, base_url=BASE_DIR).write_pdf(
+        output_path, stylesheets=[_REPORT_CSS], font_config=_FONT_CONFIG
+    )
     return output_path
@@ -12,6 +12,22 @@ document.addEventListener('DOMContentLoaded', function() {
     const propertyPriceInput = document.getElementById('property_price');
     const sidebarToggle = document.getElementById('sidebarToggle');
     const sidebar = document.getElementById('sidebar');
+    // Shared formatter; building an Intl.NumberFormat is far costlier than using one
+    const numberFormatter = new Intl.NumberFormat('en-US');
+
+    // Plotly settings shared by every chart, defined once rather than per render
+    const CHART_CONFIG = {responsive: true};
+    const CHART_FONT = {
+        family: 'system-ui',
+        size: 11,
+        color: '#495057'
+    };
+    const BAR_CHART_MARGIN = {
+        l: 50,
+        r: 20,
+        t: 20,
+        b: 40
+    };
 
     if (sidebarToggle) {
         sidebarToggle.addEventListener('click', function() {
@@ -22,6 +38,9 @@ document.addEventListener('DOMContentLoaded', function() {
     // Initialize currency input formatting
     initializeCurrencyInputs();
 
+    // KPI tooltips are static markup, so they only need to be set up once
+    initializeTooltips();
+
     // Update occupancy rate display
     occupancySlider.addEventListener('input', function() {
         occupancyValue.textContent = this.value + '%';
@@ -108,7 +127,7 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     function formatNumberWithCommas(number) {
-        return new Intl.NumberFormat('en-US').format(number);
+        return numberFormatter.format(number);
     }
 
     // Form submission
@@ -126,12 +145,7 @@ document.addEventListener('DOMContentLoaded', function() {
         exportToPDF();
     });
 
-    function calculateInvestment() {
-        // Show loading, hide other sections
-        loading.style.display = 'block';
-        results.style.display = 'none';
-        welcome.style.display = 'none';
-
+    function collectFormData() {
         // Collect form data with proper numeric values for currency inputs
         const data = {};
         const formElements = form.elements;
@@ -154,13 +168,26 @@ document.addEventListener('DOMContentLoaded', function() {
             data.down_payment = (propertyPrice * percentage / 100).toString();
         }
 
+        return data;
+    }
+
+    function calculateInvestment() {
+        // Show loading, hide other sections
+        loading.style.display = 'block';
+        results.style.display = 'none';
+        welcome.style.display = 'none';
+
+        // Snapshot the inputs once per submit; exports reuse this payload so they
+        // describe exactly what was calculated (and hit the server-side cache)
+        const payload = collectFormData();
+
         // Send request to Flask backend
         fetch('/calculate', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
             },
-            body: JSON.stringify(data)
+            body: JSON.stringify(payload)
         })
         .then(response => {
             if (!response.ok) {
@@ -169,12 +196,9 @@ document.addEventListener('DOMContentLoaded', function() {
             return response.json();
         })
         .then(data => {
-            console.log('Backend response:', data);
-            console.log('Data success field:', data.success);
-            console.log('Data keys:', Object.keys(data));
-            
             if (data.success) {
                 try {
+                    window.currentPayload = payload;
                     displayResults(data);
                 } catch (displayError) {
                     console.error('Error in displayResults:', displayError);
@@ -195,42 +219,28 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     function displayResults(data) {
-        console.log('Received data:', data);
-        
         // Show results section
         results.style.display = 'block';
 
         try {
-            console.log('Step 1: Storing data for exports');
             // Store data for exports first
             window.currentData = data;
 
-            console.log('Step 2: Updating KPI cards with:', data.charts?.kpi_data);
             // Update KPI cards
             updateKPICards(data.charts.kpi_data);
 
-            console.log('Step 3: Creating cash flow chart');
             // Update charts
             createCashFlowChart(data.charts.cash_flow_data, data.charts.break_even_amount);
-            
-            console.log('Step 4: Creating investment breakdown chart');
             createInvestmentBreakdownChart(data.charts.investment_breakdown);
-            
-            console.log('Step 5: Creating ROI comparison chart');
             createROIComparisonChart(data.charts.roi_comparison);
-            
-            console.log('Step 6: Creating monthly analysis chart');
             createMonthlyAnalysisChart(data.scenarios);
 
-            console.log('Step 7: Updating scenario table');
             // Update scenario table
             updateScenarioTable(data.scenarios);
 
-            console.log('Step 8: Updating statistics');
             // Update statistics
             updateStatistics(data);
 
-            console.log('Step 9: Updating property details');
             // Update property details
             updatePropertyDetails(data);
         } catch (error) {
@@ -240,7 +250,6 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     function updateKPICards(kpiData) {
-        console.log('Updating KPI cards with data:', kpiData);
         try {
             const advancedMetrics = window.currentData.advanced_metrics;
             
@@ -248,27 +257,18 @@ document.addEventListener('DOMContentLoaded', function() {
             document.getElementById('kpi-monthly-cash-flow').innerHTML = formatCurrencyWithColor(kpiData.monthly_cash_flow);
             document.getElementById('kpi-annual-roi').innerHTML = formatROIWithColor(kpiData.annual_roi);
             document.getElementById('kpi-cash-on-cash').innerHTML = formatCashOnCashWithColor(advancedMetrics.cash_on_cash_return);
-            document.getElementById('kpi-dscr').innerHTML = advancedMetrics.dscr < 1.0 ? `<span style="color: #dc3545; font-weight: 600;">${advancedMetrics.dscr.toFixed(2)}</span>` : advancedMetrics.dscr.toFixed(2);
+            document.getElementById('kpi-dscr').innerHTML = withValueClass(advancedMetrics.dscr.toFixed(2), advancedMetrics.dscr < 1.0 ? 'value-poor' : '');
             document.getElementById('kpi-total-investment').textContent = formatCurrency(kpiData.total_investment);
             
-            // Format payback period with color
+            // Format payback period with color (lower is better)
             const paybackYears = kpiData.break_even_years;
-            let paybackFormatted = paybackYears.toFixed(1) + ' yrs';
-            if (paybackYears > 15) {
-                paybackFormatted = `<span style="color: #dc3545; font-weight: 600;">${paybackFormatted}</span>`;
-            } else if (paybackYears > 10) {
-                paybackFormatted = `<span style="color: #ffc107; font-weight: 600;">${paybackFormatted}</span>`;
-            } else {
-                paybackFormatted = `<span style="color: #28a745; font-weight: 600;">${paybackFormatted}</span>`;
-            }
+            const paybackClass = paybackYears > 15 ? 'value-poor' : paybackYears > 10 ? 'value-warning' : 'value-good';
+            const paybackFormatted = withValueClass(paybackYears.toFixed(1) + ' yrs', paybackClass);
             document.getElementById('kpi-break-even').innerHTML = paybackFormatted;
             
             // Apply color coding
             applyKPIColorCoding(kpiData, advancedMetrics);
             
-            // Initialize tooltips
-            initializeTooltips();
-            
         } catch (error) {
             console.error('Error in updateKPICards:', error);
             throw error;
@@ -348,14 +348,6 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
     
-    function initializeTooltips() {
-        // Initialize Bootstrap tooltips
-        const tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'));
-        tooltipTriggerList.map(function (tooltipTriggerEl) {
-            return new bootstrap.Tooltip(tooltipTriggerEl);
-        });
-    }
-
     function createCashFlowChart(cashFlowData, breakEvenAmount) {
         const traces = [];
         const colors = {
@@ -414,11 +406,7 @@ document.addEventListener('DOMContentLoaded', function() {
             },
             plot_bgcolor: 'white',
             paper_bgcolor: 'white',
-            font: {
-                family: 'system-ui',
-                size: 11,
-                color: '#495057'
-            },
+            font: CHART_FONT,
             legend: {
                 orientation: 'h',
                 yanchor: 'bottom',
@@ -435,7 +423,7 @@ document.addEventListener('DOMContentLoaded', function() {
             height: 300
         };
 
-        Plotly.newPlot('cash-flow-chart', traces, layout, {responsive: true});
+        Plotly.react('cash-flow-chart', traces, layout, CHART_CONFIG);
     }
 
     function createInvestmentBreakdownChart(breakdownData) {
@@ -482,7 +470,7 @@ document.addEventListener('DOMContentLoaded', function() {
             height: 300
         };
 
-        Plotly.newPlot('investment-breakdown-chart', data, layout, {responsive: true});
+        Plotly.react('investment-breakdown-chart', data, layout, CHART_CONFIG);
     }
 
     function createROIComparisonChart(roiData) {
@@ -511,32 +499,21 @@ document.addEventListener('DOMContentLoaded', function() {
             },
             plot_bgcolor: 'white',
             paper_bgcolor: 'white',
-            font: {
-                family: 'system-ui',
-                size: 11,
-                color: '#495057'
-            },
-            margin: {
-                l: 50,
-                r: 20,
-                t: 20,
-                b: 40
-            },
+            font: CHART_FONT,
+            margin: BAR_CHART_MARGIN,
             height: 300
         };
 
-        Plotly.newPlot('roi-comparison-chart', data, layout, {responsive: true});
+        Plotly.react('roi-comparison-chart', data, layout, CHART_CONFIG);
     }
 
     function createMonthlyAnalysisChart(scenarios) {
         const baseScenario = scenarios.base;
-        const occupancyRate = window.currentData && window.currentData.calculator_data ? 
-                            window.currentData.calculator_data.occupancy_rate : 95;
+        const calculatorData = window.currentData && window.currentData.calculator_data;
+        const occupancyRate = calculatorData ? calculatorData.occupancy_rate : 95;
         const effectiveRent = baseScenario.monthly_rent * occupancyRate / 100;
-        const monthlyPayment = window.currentData && window.currentData.calculator_data ? 
-                              window.currentData.calculator_data.monthly_payment : 0;
-        const monthlyHOA = window.currentData && window.currentData.calculator_data ? 
-                          (window.currentData.calculator_data.hoa_fees_annual || 0) / 12 : 0;
+        const monthlyPayment = calculatorData ? calculatorData.monthly_payment : 0;
+        const monthlyHOA = calculatorData ? (calculatorData.hoa_fees_annual || 0) / 12 : 0;
         
         const data = [{
             x: ['Rental Income', 'Mortgage Payment', 'HOA Fees', 'Net Cash Flow'],
@@ -564,17 +541,8 @@ document.addEventListener('DOMContentLoaded', function() {
             },
             plot_bgcolor: 'white',
             paper_bgcolor: 'white',
-            font: {
-                family: 'system-ui',
-                size: 11,
-                color: '#495057'
-            },
-            margin: {
-                l: 50,
-                r: 20,
-                t: 20,
-                b: 40
-            },
+            font: CHART_FONT,
+            margin: BAR_CHART_MARGIN,
             height: 300
         };
 
@@ -592,12 +560,11 @@ document.addEventListener('DOMContentLoaded', function() {
             }
         }];
 
-        Plotly.newPlot('monthly-analysis-chart', data, layout, {responsive: true});
+        Plotly.react('monthly-analysis-chart', data, layout, CHART_CONFIG);
     }
 
     function updateScenarioTable(scenarios) {
         const tableBody = document.getElementById('scenario-table-body');
-        tableBody.innerHTML = '';
 
         const scenarioNames = {
             'conservative': 'Conservative',
@@ -608,12 +575,12 @@ document.addEventListener('DOMContentLoaded', function() {
         // Define the order: Conservative, Base, Optimistic
         const scenarioOrder = ['conservative', 'base', 'optimistic'];
 
+        // Build every row first and write the table body once
+        const rows = [];
         for (const key of scenarioOrder) {
             const scenario = scenarios[key];
             if (!scenario) continue;
             
-            const row = document.createElement('tr');
-            
             // Format values with red color for negatives
             const monthlyRent = formatCurrency(scenario.monthly_rent);
             const monthlyCashFlow = formatCurrencyWithColor(scenario.monthly_cash_flow);
@@ -621,16 +588,18 @@ document.addEventListener('DOMContentLoaded', function() {
             const roi = formatPercentageWithColor(scenario.roi);
             const irr = scenario.irr ? formatPercentageWithColor(scenario.irr) : 'N/A';
             
-            row.innerHTML = `
+            rows.push(`
+                <tr>
                 <td><strong>${scenarioNames[key]}</strong></td>
                 <td>${monthlyRent}</td>
                 <td>${monthlyCashFlow}</td>
                 <td>${annualCashFlow}</td>
                 <td>${roi}</td>
                 <td>${irr}</td>
-            `;
-            tableBody.appendChild(row);
+                </tr>
+            `);
         }
+        tableBody.innerHTML = rows.join('');
     }
 
     function updateStatistics(data) {
@@ -670,19 +639,7 @@ document.addEventListener('DOMContentLoaded', function() {
             return;
         }
 
-        // Get form data with proper numeric values
-        const data = {};
-        const formElements = form.elements;
-        
-        for (let element of formElements) {
-            if (element.name) {
-                if (element.classList.contains('currency-input')) {
-                    data[element.name] = element.getAttribute('data-value') || '0';
-                } else {
-                    data[element.name] = element.value;
-                }
-            }
-        }
+        const data = window.currentPayload;
 
         fetch('/export_excel', {
             method: 'POST',
@@ -714,26 +671,7 @@ document.addEventListener('DOMContentLoaded', function() {
             return;
         }
 
-        // Get form data with proper numeric values
-        const data = {};
-        const formElements = form.elements;
-        
-        for (let element of formElements) {
-            if (element.name) {
-                if (element.classList.contains('currency-input')) {
-                    data[element.name] = element.getAttribute('data-value') || '0';
-                } else {
-                    data[element.name] = element.value;
-                }
-            }
-        }
-        
-        // Calculate down payment amount from percentage
-        if (data.down_payment_percentage) {
-            const propertyPrice = parseInt(data.property_price || '0');
-            const percentage = parseFloat(data.down_payment_percentage);
-            data.down_payment = (propertyPrice * percentage / 100).toString();
-        }
+        const data = window.currentPayload;
 
         fetch('/export_pdf', {
             method: 'POST',
@@ -765,50 +703,37 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     function formatCurrency(amount) {
-        return 'SAR ' + new Intl.NumberFormat('en-US').format(Math.round(amount));
+        return 'SAR ' + numberFormatter.format(Math.round(amount));
     }
 
     function formatPercentage(percentage) {
         return percentage.toFixed(2) + '%';
     }
     
+    // Wrap a formatted value in a color class; an empty class leaves it plain
+    function withValueClass(formatted, className) {
+        return className ? `<span class="${className}">${formatted}</span>` : formatted;
+    }
+
+    // Higher is better: above `good` is good, from `warning` up is a warning
+    function thresholdClass(value, good, warning) {
+        return value > good ? 'value-good' : value >= warning ? 'value-warning' : 'value-poor';
+    }
+    
     function formatCurrencyWithColor(amount) {
-        const formatted = formatCurrency(amount);
-        if (amount < 0) {
-            return `<span style="color: #dc3545; font-weight: 600;">${formatted}</span>`;
-        } else if (amount > 0) {
-            return `<span style="color: #28a745; font-weight: 600;">${formatted}</span>`;
-        }
-        return `<span style="color: #ffc107; font-weight: 600;">${formatted}</span>`;
+        const className = amount < 0 ? 'value-poor' : amount > 0 ? 'value-good' : 'value-warning';
+        return withValueClass(formatCurrency(amount), className);
     }
     
     function formatPercentageWithColor(percentage) {
-        const formatted = formatPercentage(percentage);
-        if (percentage < 0) {
-            return `<span style="color: #dc3545; font-weight: 600;">${formatted}</span>`;
-        }
-        return formatted;
+        return withValueClass(formatPercentage(percentage), percentage < 0 ? 'value-poor' : '');
     }
     
     function formatROIWithColor(percentage) {
-        const formatted = formatPercentage(percentage);
-        if (percentage > 8) {
-            return `<span style="color: #28a745; font-weight: 600;">${formatted}</span>`;
-        } else if (percentage >= 5) {
-            return `<span style="color: #ffc107; font-weight: 600;">${formatted}</span>`;
-        } else {
-            return `<span style="color: #dc3545; font-weight: 600;">${formatted}</span>`;
-        }
+        return withValueClass(formatPercentage(percentage), thresholdClass(percentage, 8, 5));
     }
     
     function formatCashOnCashWithColor(percentage) {
-        const formatted = formatPercentage(percentage);
-        if (percentage > 10) {
-            return `<span style="color: #28a745; font-weight: 600;">${formatted}</span>`;
-        } else if (percentage >= 5) {
-            return `<span style="color: #ffc107; font-weight: 600;">${formatted}</span>`;
-        } else {
-            return `<span style="color: #dc3545; font-weight: 600;">${formatted}</span>`;
-        }
+        return withValueClass(formatPercentage(percentage), thresholdClass(percentage, 10, 5));
     }
 });
\ No newline at end of file
@@ -57,3 +57,47 @@ def test_rent_growth_escalates_cash_flow():
 
     assert growth_schedule[1] > flat_schedule[1]
     assert growth_schedule[2] > growth_schedule[1]
+
+
+def test_scenario_analysis_is_cached():
+    calc = FinancialCalculator(100000, 20000, 30, 5.0, 1500, 100)
+    assert calc._scenario_results() is calc._scenario_results()
+    assert calc.get_scenario_analysis() == calc.get_scenario_analysis()
+
+
+def test_irr_newton_matches_textbook_example():
+    from financial_calculator import _irr_newton
+
+    assert _irr_newton([-100, 39, 59, 55, 20]) == pytest.approx(0.28095, abs=1e-5)
+
+
+def test_amortization_schedule_pays_off_loan():
+    calc = FinancialCalculator(100000, 20000, 30, 5.0, 1500, 100)
+    schedule = calc.get_amortization_schedule()
+    assert len(schedule['period']) == 360
+    assert sum(schedule['principal']) == pytest.approx(80000)
+    assert schedule['balance'][-1] == pytest.approx(0, abs=1e-6)
+    assert schedule['interest'][0] == pytest.approx(80000 * 0.05 / 12)
+
+
+def test_irr_is_none_without_sign_change():
+    # Cash purchase with rent far below costs: every flow is negative
+    calc = FinancialCalculator(100000, 100000, 30, 5.0, 0, 100, hoa_fees_annual=1200, resale_value=1)
+    assert calc.get_irr() is None
+
+
+def test_calculator_inputs_are_read_only():
+    calc = FinancialCalculator(100000, 20000, 30, 5.0, 1500, 100)
+    with pytest.raises(AttributeError):
+        calc.interest_rate = 6.0
+    assert calc.get_monthly_payment() == pytest.approx(429.46, abs=0.1)
+
+
+def test_scenario_analysis_returns_a_copy():
+    calc = FinancialCalculator(100000, 20000, 30, 5.0, 1500, 100)
+    scenarios = calc.get_scenario_analysis()
+    scenarios['base']['roi'] = None
+    scenarios['base']['cash_flow_schedule'].append(0.0)
+    fresh = calc.get_scenario_analysis()['base']
+    assert fresh['roi'] is not None
+    assert len(fresh['cash_flow_schedule']) == calc.holding_period
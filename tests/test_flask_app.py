@@ -0,0 +1,121 @@
+import os
+import subprocess
+import sys
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from flask_app import app
+
+
+PAYLOAD = {
+    'property_price': '500,000',
+    'down_payment': '100,000',
+    'loan_term': 30,
+    'interest_rate': 5.0,
+    'base_monthly_rent': '36,000',
+    'occupancy_rate': 95,
+    'rent_growth': 2,
+    'enhancement_costs': 10000,
+    'hoa_fees_annual': 1200,
+    'holding_period': 10,
+    'resale_value': 600000,
+}
+
+
+def test_calculate_returns_scenarios():
+    client = app.test_client()
+    response = client.post('/calculate', json=PAYLOAD)
+    body = response.get_json()
+    assert body['success'] is True
+    assert set(body['scenarios']) == {'conservative', 'base', 'optimistic'}
+    assert len(body['charts']['cash_flow_data']['scenarios']['Base']) == 10
+    assert 'cash_flow_schedule' not in body['scenarios']['base']
+
+
+def test_import_does_not_load_pdf_stack():
+    # A fresh interpreter, so modules imported by other tests do not count
+    result = subprocess.run(
+        [sys.executable, '-c',
+         'import flask_app, sys; '
+         'assert "report_generator" not in sys.modules; '
+         'assert "weasyprint" not in sys.modules'],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_export_excel_keeps_scenario_values_numeric():
+    import io
+    from openpyxl import load_workbook
+
+    client = app.test_client()
+    response = client.post('/export_excel', json=PAYLOAD)
+    assert response.status_code == 200
+    sheet = load_workbook(io.BytesIO(response.data))['Scenario Analysis']
+    cash_flow = sheet['C3']
+    assert isinstance(cash_flow.value, float)
+    assert cash_flow.number_format.startswith('"SAR "')
+
+
+def test_export_excel_keeps_amortization_numeric():
+    import io
+    from openpyxl import load_workbook
+
+    client = app.test_client()
+    response = client.post('/export_excel', json=PAYLOAD)
+    sheet = load_workbook(io.BytesIO(response.data))['Amortization (5 Years)']
+    payment = sheet['B2']
+    assert isinstance(payment.value, float)
+    assert payment.value == round(payment.value, 2)
+    assert payment.number_format == '#,##0.00'
+
+
+def test_sanitize_json_data_clears_non_finite_values_in_mixed_lists():
+    from flask_app import sanitize_json_data
+
+    data = {'x': [1, 'b', float('inf')], 'y': ['a', float('nan')], 'z': [1.5, 2.5]}
+    assert sanitize_json_data(data) == {'x': [1, 'b', None], 'y': ['a', None], 'z': [1.5, 2.5]}
+
+
+def test_jsonify_encodes_with_orjson():
+    import numpy as np
+    from flask import jsonify
+
+    pytest.importorskip('orjson')
+    payload = {'b': np.float64(1.5), 'a': np.arange(2)}
+    with app.app_context():
+        # The stdlib encoder cannot serialize numpy values
+        assert jsonify(payload).get_data(as_text=True) == '{"a":[0,1],"b":1.5}\n'
+        assert app.json.dumps(payload, indent=2) == '{\n  "a": [\n    0,\n    1\n  ],\n  "b": 1.5\n}'
+
+
+def test_clean_numeric_input():
+    from flask_app import clean_numeric_input
+
+    assert clean_numeric_input('1,875,000') == 1875000.0
+    assert clean_numeric_input('6.5') == 6.5
+    assert clean_numeric_input(135000) == 135000.0
+    with pytest.raises(ValueError):
+        clean_numeric_input('12,5a')
+
+
+def test_cached_advanced_metrics_returns_a_copy():
+    from flask_app import _cached_advanced_metrics, _calculator_inputs
+
+    inputs = _calculator_inputs(PAYLOAD)
+    _cached_advanced_metrics(inputs)['payback_period'] = None
+    assert _cached_advanced_metrics(inputs)['payback_period'] is not None
+
+
+def test_request_bodies_decode_with_orjson(monkeypatch):
+    orjson = pytest.importorskip('orjson')
+    import flask_app
+
+    decoded = []
+    loads = orjson.loads
+    monkeypatch.setattr(flask_app.orjson, 'loads', lambda s: decoded.append(s) or loads(s))
+    response = app.test_client().post('/calculate', json=PAYLOAD)
+    assert response.get_json()['success'] is True
+    assert loads(decoded[0]) == PAYLOAD
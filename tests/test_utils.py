@@ -7,3 +7,15 @@ from utils import calculate_debt_service_coverage_ratio
 
 def test_dscr():
     assert calculate_debt_service_coverage_ratio(12000, 10000) == 1.2
+
+
+def test_export_excel_marks_missing_irr_on_both_scenario_sheets():
+    from openpyxl import load_workbook
+    from financial_calculator import FinancialCalculator
+    from utils import export_to_excel
+
+    calc = FinancialCalculator(500000, 100000, 30, 5.0, 3000, 95)
+    scenarios = {key: dict(value, irr=None) for key, value in calc.get_scenario_analysis().items()}
+    workbook = load_workbook(export_to_excel(calc, scenarios))
+    assert workbook['Scenario Analysis']['F2'].value == 'N/A'
+    assert workbook['Detailed Scenarios']['H2'].value == 'N/A'
@@ -1,167 +1,208 @@
 import io
-from typing import Dict, Any
+import math
+from typing import Dict, Any, Iterable, List, Optional, Sequence
 from financial_calculator import FinancialCalculator
-from helpers import (
-    format_currency,
-    format_currency_with_color,
-    format_percentage,
-    format_percentage_with_color,
-    format_number,
-    format_number_with_unit,
-)
+from helpers import format_currency, format_percentage
 
 # Heavy third-party libraries are imported lazily inside the functions that
 # require them. This allows basic utilities to be used in environments where
 # optional dependencies like pandas or reportlab are not installed.
 
+# Excel number formats mirroring format_currency / format_percentage, so that
+# exported cells stay numeric while displaying like the rest of the app.
+EXCEL_CURRENCY_FORMAT = '"SAR "#,##0;"SAR ("#,##0")"'
+EXCEL_PERCENTAGE_FORMAT = '0.00"%";"("0.00"%)"'
+# Plain two-decimal amounts for the amortization schedule
+EXCEL_AMOUNT_FORMAT = '#,##0.00'
+
+SCENARIO_COLUMNS = ['Scenario', 'Monthly Cash Flow', 'Annual Cash Flow', 'Annual ROI', 'Monthly Rent', 'IRR']
+
+SCENARIO_COLUMN_FORMATS = {
+    'Monthly Cash Flow': EXCEL_CURRENCY_FORMAT,
+    'Annual Cash Flow': EXCEL_CURRENCY_FORMAT,
+    'Annual ROI': EXCEL_PERCENTAGE_FORMAT,
+    'Monthly Rent': EXCEL_CURRENCY_FORMAT,
+    'IRR': EXCEL_PERCENTAGE_FORMAT,
+}
+
+
+# Bold, bordered header row shared by every exported sheet
+EXCEL_HEADER_STYLE = {'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}
+
+# Risk levels in increasing order; an assessment only ever escalates
+RISK_LEVELS = ('Low', 'Medium', 'High')
+
+# Recommendations that apply to every investment, appended after the
+# analysis-specific ones
+GENERAL_RECOMMENDATIONS = (
+    "Conduct thorough due diligence on the property and neighborhood",
+    "Consider hiring a property management company if you lack experience",
+    "Regularly review and adjust rent to market rates",
+    "Maintain adequate insurance coverage for the property",
+)
+
+
+def _write_sheet(workbook, sheet_name: str, columns: List[str], rows: Iterable[Sequence], header_format,
+                 column_formats: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Write a header and rows to a new worksheet, one row at a time. Missing
+    values become empty cells.
+    """
+    worksheet = workbook.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, columns, header_format)
+    column_formats = column_formats or {}
+    cell_formats = [column_formats.get(column) for column in columns]
+    for row_idx, row in enumerate(rows, start=1):
+        for col_idx, value in enumerate(row):
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                # Only written if the column has a format, like pandas' na_rep
+                worksheet.write_blank(row_idx, col_idx, None, cell_formats[col_idx])
+            else:
+                worksheet.write(row_idx, col_idx, value, cell_formats[col_idx])
+
+
+def _scenario_rows(scenarios: Dict) -> List[tuple]:
+    """Scenario comparison rows; values stay numeric and are formatted by Excel."""
+    scenario_rows = []
+    for scenario_key, scenario_name in [('conservative', 'Conservative'), ('base', 'Base'), ('optimistic', 'Optimistic')]:
+        s = scenarios[scenario_key]
+        scenario_rows.append((
+            scenario_name,
+            s['monthly_cash_flow'],
+            s['annual_cash_flow'],
+            s['roi'],
+            s['monthly_rent'],
+            # Same sentinel as the Detailed Scenarios sheet
+            s['irr'] if s['irr'] is not None else 'N/A'
+        ))
+    return scenario_rows
+
 
-def export_to_excel(calculator: FinancialCalculator, scenarios: Dict, scenario_df: 'pd.DataFrame') -> io.BytesIO:
+def export_to_excel(calculator: FinancialCalculator, scenarios: Dict) -> io.BytesIO:
     """
     Export the investment analysis to an Excel file.
     Returns a BytesIO buffer containing the Excel file.
     """
-    # Import pandas lazily so that this module can be imported without the
-    # dependency installed.  The export functions will raise an informative
-    # error if pandas is unavailable.
+    # Import numpy and xlsxwriter lazily so that this module can be imported
+    # without the dependencies installed.  The export functions will raise an
+    # informative error if they are unavailable. Rows go straight to
+    # xlsxwriter without pandas.
     try:
-        import pandas as pd  # type: ignore
+        import numpy as np  # type: ignore
+        import xlsxwriter  # type: ignore
     except Exception as exc:  # pragma: no cover - optional dependency
-        raise ImportError("pandas is required for export_to_excel") from exc
+        raise ImportError("numpy and xlsxwriter are required for export_to_excel") from exc
 
     buffer = io.BytesIO()
     
-    # Type ignore to suppress the LSP warning - this is a known working pattern
-    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:  # type: ignore
-        # Investment Summary Sheet
-        summary = calculator.get_investment_summary()
-        summary_data = {
-            'Metric': [],
-            'Value': []
+    # The workbook is small (a 60-row amortization schedule at most), so it is
+    # assembled entirely in memory rather than through per-sheet temp files
+    with xlsxwriter.Workbook(buffer, {'in_memory': True}) as workbook:
+        # Formats belong to the workbook; create each once and share it
+        header_format = workbook.add_format(EXCEL_HEADER_STYLE)
+        number_formats = {
+            number_format: workbook.add_format({'num_format': number_format})
+            for number_format in {*SCENARIO_COLUMN_FORMATS.values(), EXCEL_AMOUNT_FORMAT}
         }
         
-        # Property Information
-        summary_data['Metric'].extend([
-            'Property Price',
-            'Down Payment',
-            'Enhancement Costs',
-            'Total Initial Investment',
-            'Loan Amount',
-            'Loan Term (Years)',
-            'Interest Rate (%)',
-            'Interest Type',
-            'Monthly Payment'
-        ])
-        
-        summary_data['Value'].extend([
-            format_currency(summary['property_price']),
-            format_currency(summary['down_payment']),
-            format_currency(calculator.enhancement_costs),
-            format_currency(summary['total_initial_investment']),
-            format_currency(summary['loan_amount']),
-            str(calculator.loan_term),
-            f"{calculator.interest_rate:.2f}%",
-            calculator.interest_type.title(),
-            format_currency(summary['monthly_payment'])
-        ])
-        
-        # Rental Information
-        summary_data['Metric'].extend([
-            '',  # Empty row
-            'Base Annual Rent',
-            'Base Monthly Rent',
-            'Occupancy Rate (%)',
-            'Effective Monthly Rent',
-            'Annual HOA Fees',
-            'Monthly Cash Flow',
-            'Annual Cash Flow'
-        ])
-        
-        summary_data['Value'].extend([
-            '',
-            format_currency(summary['base_monthly_rent'] * 12),
-            format_currency(summary['base_monthly_rent']),
-            f"{calculator.occupancy_rate}%",
-            format_currency(summary['effective_monthly_rent']),
-            format_currency(calculator.hoa_fees_annual),
-            format_currency(summary['monthly_cash_flow']),
-            format_currency(summary['annual_cash_flow'])
-        ])
-        
-        # Investment Returns
-        summary_data['Metric'].extend([
-            '',  # Empty row
-            'Annual ROI (%)',
-            'IRR (%)',
-            'Holding Period (Years)',
-            'Expected Resale Value',
-            'Expected Capital Gain',
-            'Total Interest Paid'
-        ])
-        
-        summary_data['Value'].extend([
-            '',
-            format_percentage(summary['roi']),
-            format_percentage(summary['irr']) if summary['irr'] is not None else 'N/A',
-            str(summary['holding_period']),
-            format_currency(summary['expected_resale_value']),
-            format_currency(summary['expected_capital_gain']),
-            format_currency(summary['total_interest'])
-        ])
+        # Investment Summary Sheet
+        summary = calculator.get_investment_summary()
+        summary_rows = (
+            # Property Information
+            ('Property Price', format_currency(summary['property_price'])),
+            ('Down Payment', format_currency(summary['down_payment'])),
+            ('Enhancement Costs', format_currency(calculator.enhancement_costs)),
+            ('Total Initial Investment', format_currency(summary['total_initial_investment'])),
+            ('Loan Amount', format_currency(summary['loan_amount'])),
+            ('Loan Term (Years)', str(calculator.loan_term)),
+            ('Interest Rate (%)', f"{calculator.interest_rate:.2f}%"),
+            ('Interest Type', calculator.interest_type.title()),
+            ('Monthly Payment', format_currency(summary['monthly_payment'])),
+            
+            # Rental Information
+            ('', ''),  # Empty row
+            ('Base Annual Rent', format_currency(summary['base_monthly_rent'] * 12)),
+            ('Base Monthly Rent', format_currency(summary['base_monthly_rent'])),
+            ('Occupancy Rate (%)', f"{calculator.occupancy_rate}%"),
+            ('Effective Monthly Rent', format_currency(summary['effective_monthly_rent'])),
+            ('Annual HOA Fees', format_currency(calculator.hoa_fees_annual)),
+            ('Monthly Cash Flow', format_currency(summary['monthly_cash_flow'])),
+            ('Annual Cash Flow', format_currency(summary['annual_cash_flow'])),
+            
+            # Investment Returns
+            ('', ''),  # Empty row
+            ('Annual ROI (%)', format_percentage(summary['roi'])),
+            ('IRR (%)', format_percentage(summary['irr']) if summary['irr'] is not None else 'N/A'),
+            ('Holding Period (Years)', str(summary['holding_period'])),
+            ('Expected Resale Value', format_currency(summary['expected_resale_value'])),
+            ('Expected Capital Gain', format_currency(summary['expected_capital_gain'])),
+            ('Total Interest Paid', format_currency(summary['total_interest'])),
+        )
         
-        summary_df = pd.DataFrame(summary_data)
-        summary_df.to_excel(writer, sheet_name='Investment Summary', index=False)
+        _write_sheet(workbook, 'Investment Summary', ['Metric', 'Value'], summary_rows, header_format)
         
         # Scenario Analysis Sheet
-        scenario_df.to_excel(writer, sheet_name='Scenario Analysis', index=False)
+        _write_sheet(workbook, 'Scenario Analysis', SCENARIO_COLUMNS, _scenario_rows(scenarios), header_format, {
+            column: number_formats[number_format]
+            for column, number_format in SCENARIO_COLUMN_FORMATS.items()
+        })
         
         # Detailed Scenario Data
-        detailed_scenarios = []
+        detailed_rows = []
         for scenario_name, scenario_data in scenarios.items():
-            detailed_scenarios.append({
-                'Scenario': scenario_name.title(),
-                'Monthly Rent': scenario_data['monthly_rent'],
-                'Effective Monthly Rent': scenario_data['effective_monthly_rent'],
-                'Monthly Cash Flow': scenario_data['monthly_cash_flow'],
-                'Annual Net Income': scenario_data['annual_net_income'],
-                'Annual Cash Flow': scenario_data['annual_cash_flow'],
-                'ROI (%)': scenario_data['roi'],
-                'IRR (%)': scenario_data['irr'] if scenario_data['irr'] is not None else 'N/A'
-            })
+            detailed_rows.append((
+                scenario_name.title(),
+                scenario_data['monthly_rent'],
+                scenario_data['effective_monthly_rent'],
+                scenario_data['monthly_cash_flow'],
+                scenario_data['annual_net_income'],
+                scenario_data['annual_cash_flow'],
+                scenario_data['roi'],
+                scenario_data['irr'] if scenario_data['irr'] is not None else 'N/A'
+            ))
         
-        detailed_df = pd.DataFrame(detailed_scenarios)
-        detailed_df.to_excel(writer, sheet_name='Detailed Scenarios', index=False)
+        _write_sheet(workbook, 'Detailed Scenarios', [
+            'Scenario', 'Monthly Rent', 'Effective Monthly Rent', 'Monthly Cash Flow',
+            'Annual Net Income', 'Annual Cash Flow', 'ROI (%)', 'IRR (%)'
+        ], detailed_rows, header_format)
         
         # Amortization Schedule (first 5 years)
         amortization = calculator.get_amortization_schedule(60)  # 5 years = 60 months
-        amort_df = pd.DataFrame(amortization)
-        
-        # Format the amortization schedule
-        if not amort_df.empty:
-            amort_df['payment'] = amort_df['payment'].apply(lambda x: f"{x:.2f}")
-            amort_df['principal'] = amort_df['principal'].apply(lambda x: f"{x:.2f}")
-            amort_df['interest'] = amort_df['interest'].apply(lambda x: f"{x:.2f}")
-            amort_df['balance'] = amort_df['balance'].apply(lambda x: f"{x:.2f}")
-            
-            # Rename columns for better readability
-            amort_df.columns = ['Period', 'Payment ($)', 'Principal ($)', 'Interest ($)', 'Remaining Balance ($)']
-            amort_df.to_excel(writer, sheet_name='Amortization (5 Years)', index=False)
         
-        # Cash Flow Projections
-        cash_flow_data = []
-        for year in range(1, calculator.holding_period + 1):
-            base_scenario = scenarios['base']
-            cash_flow_data.append({
-                'Year': year,
-                'Conservative Cash Flow': scenarios['conservative']['cash_flow_schedule'][year-1],
-                'Base Cash Flow': base_scenario['cash_flow_schedule'][year-1],
-                'Optimistic Cash Flow': scenarios['optimistic']['cash_flow_schedule'][year-1],
-                'Cumulative Conservative': sum(scenarios['conservative']['cash_flow_schedule'][:year]),
-                'Cumulative Base': sum(base_scenario['cash_flow_schedule'][:year]),
-                'Cumulative Optimistic': sum(scenarios['optimistic']['cash_flow_schedule'][:year])
+        # Amounts stay numeric, rounded to cents, and display through a number format
+        if amortization['period']:
+            amort_rows = (
+                (period, round(payment, 2), round(principal, 2), round(interest, 2), round(balance, 2))
+                for period, payment, principal, interest, balance in zip(
+                    amortization['period'], amortization['payment'], amortization['principal'],
+                    amortization['interest'], amortization['balance']
+                )
+            )
+            amount_format = number_formats[EXCEL_AMOUNT_FORMAT]
+            _write_sheet(workbook, 'Amortization (5 Years)', [
+                'Period', 'Payment ($)', 'Principal ($)', 'Interest ($)', 'Remaining Balance ($)'
+            ], amort_rows, header_format, {
+                'Payment ($)': amount_format,
+                'Principal ($)': amount_format,
+                'Interest ($)': amount_format,
+                'Remaining Balance ($)': amount_format,
             })
         
-        cash_flow_df = pd.DataFrame(cash_flow_data)
-        cash_flow_df.to_excel(writer, sheet_name='Cash Flow Projections', index=False)
+        # Cash Flow Projections: one (year, scenario) matrix, accumulated down
+        # the years in a single pass instead of re-summing a slice per year
+        cash_flows = np.array(
+            [scenarios[key]['cash_flow_schedule'][:calculator.holding_period]
+             for key in ('conservative', 'base', 'optimistic')],
+            dtype=float
+        ).T
+        cumulative = np.cumsum(cash_flows, axis=0)
+        _write_sheet(workbook, 'Cash Flow Projections', [
+            'Year', 'Conservative Cash Flow', 'Base Cash Flow', 'Optimistic Cash Flow',
+            'Cumulative Conservative', 'Cumulative Base', 'Cumulative Optimistic'
+        ], (
+            (year, *flows, *totals)
+            for year, (flows, totals) in enumerate(zip(cash_flows.tolist(), cumulative.tolist()), start=1)
+        ), header_format)
     
     buffer.seek(0)
     return buffer
@@ -199,43 +240,41 @@ def get_risk_assessment(calculator: FinancialCalculator, scenarios: Dict) -> Dic
     """
     base_scenario = scenarios['base']
     conservative_scenario = scenarios['conservative']
+    base_monthly_cash_flow = base_scenario['monthly_cash_flow']
     
     risk_factors = []
-    risk_level = "Low"
+    risk_rank = 0  # index into RISK_LEVELS
     
     # Check cash flow
-    if base_scenario['monthly_cash_flow'] < 0:
+    if base_monthly_cash_flow < 0:
         risk_factors.append("Negative cash flow in base scenario")
-        risk_level = "High"
-    elif base_scenario['monthly_cash_flow'] < 200:
+        risk_rank = 2
+    elif base_monthly_cash_flow < 200:
         risk_factors.append("Low cash flow margin")
-        if risk_level == "Low":
-            risk_level = "Medium"
+        risk_rank = max(risk_rank, 1)
     
     # Check conservative scenario
     if conservative_scenario['monthly_cash_flow'] < 0:
         risk_factors.append("Negative cash flow in conservative scenario")
-        risk_level = "High"
+        risk_rank = 2
     
     # Check ROI
     if base_scenario['roi'] < 5:
         risk_factors.append("Low ROI compared to market alternatives")
-        if risk_level == "Low":
-            risk_level = "Medium"
+        risk_rank = max(risk_rank, 1)
     
     # Check down payment ratio
     down_payment_ratio = (calculator.down_payment / calculator.property_price) * 100
     if down_payment_ratio < 15:
         risk_factors.append("Low down payment increases leverage risk")
-        if risk_level == "Low":
-            risk_level = "Medium"
+        risk_rank = max(risk_rank, 1)
     
     # Check occupancy rate sensitivity
     if calculator.occupancy_rate < 90:
         risk_factors.append("Low occupancy rate assumption increases vacancy risk")
-        if risk_level == "Low":
-            risk_level = "Medium"
+        risk_rank = max(risk_rank, 1)
     
+    risk_level = RISK_LEVELS[risk_rank]
     return {
         'risk_level': risk_level,
         'risk_factors': risk_factors,
@@ -264,12 +303,7 @@ def get_recommendations(calculator: FinancialCalculator, scenarios: Dict, risk_l
         recommendations.append("Build a larger cash reserve for unexpected expenses and vacancies")
     
     # Always include general recommendations
-    recommendations.extend([
-        "Conduct thorough due diligence on the property and neighborhood",
-        "Consider hiring a property management company if you lack experience",
-        "Regularly review and adjust rent to market rates",
-        "Maintain adequate insurance coverage for the property"
-    ])
+    recommendations.extend(GENERAL_RECOMMENDATIONS)
     
     return recommendations
 
@@ -313,7 +347,7 @@ def get_advanced_metrics(calculator) -> Dict[str, Any]:
     total_initial_investment = calculator.get_total_initial_investment()
 
     annual_net_income = net_income_schedule[0] if net_income_schedule else 0
-    avg_cash_flow = sum(cash_flow_schedule) / len(cash_flow_schedule) if cash_flow_schedule else 0
+    avg_cash_flow = base_scenario['annual_cash_flow']  # already the schedule's mean
 
     dscr = calculate_debt_service_coverage_ratio(annual_net_income, annual_debt_service)
     cash_on_cash = calculate_cash_on_cash_return(avg_cash_flow, total_initial_investment)